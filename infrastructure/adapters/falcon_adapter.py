@@ -1,10 +1,10 @@
 import logging
-import time
 from typing import Iterable
 
 import requests
 from falconpy import Hosts, Detects, APIError  # requiere `pip install falconpy`
 from falcon_app.infrastructure.falcon_auth_manager import FalconAuthManager
+from falcon_app.infrastructure.services.deadline import Deadline, DeadlineExceeded, PartialList
 
 logger = logging.getLogger(__name__)
 
@@ -12,55 +12,125 @@ class FalconPyAdapter:
     """Adapter de integración con CrowdStrike Falcon SDK (bloqueante)."""
 
     BASE_URL = "https://api.crowdstrike.com"
+    REQUEST_TIMEOUT = 30
+    # Tope de resultados por consulta paginada para no agotar el rate limit del tenant.
+    MAX_RESULTS = 1000
 
     def __init__(self, tenant_id: str, client_id: str, client_secret: str):
         self.tenant_id = tenant_id
         self.auth_manager = FalconAuthManager(tenant_id, client_id, client_secret)
 
     # Factory cliente
-    def _client_hosts(self):
-        token = self.auth_manager.get_token()
-        return Hosts(bearer_token=token)
+    def _client_hosts(self, deadline: Deadline | None = None):
+        deadline = deadline or Deadline()
+        token = self.auth_manager.get_token(deadline)
+        return Hosts(bearer_token=token, timeout=deadline.timeout(self.REQUEST_TIMEOUT))
 
-    def _client_detects(self):
-        token = self.auth_manager.get_token()
-        return Detects(bearer_token=token)
+    def _client_detects(self, deadline: Deadline | None = None):
+        deadline = deadline or Deadline()
+        token = self.auth_manager.get_token(deadline)
+        return Detects(bearer_token=token, timeout=deadline.timeout(self.REQUEST_TIMEOUT))
 
     # HTTP helpers
-    def _request(self, method: str, path: str, params: dict | None = None):
+    def _retry_sleep(self, deadline: Deadline, seconds: float, error: Exception):
+        """Espera antes de reintentar; si la espera no cabe en el presupuesto propaga el error original."""
+        try:
+            deadline.sleep(seconds)
+        except DeadlineExceeded:
+            if deadline.cancelled:
+                raise
+            raise error
+
+    def _request(self, method: str, path: str, params: dict | None = None, deadline: Deadline | None = None):
+        """Petición con reintentos; el timeout se recorta al presupuesto restante del deadline."""
+        deadline = deadline or Deadline()
         retries = 3
         delay = 2
+        url = f"{self.BASE_URL}{path}"
         for attempt in range(retries):
-            token = self.auth_manager.get_token()
-            headers = {"Authorization": f"Bearer {token}"}
-            url = f"{self.BASE_URL}{path}"
             try:
-                response = requests.request(method, url, headers=headers, params=params, timeout=30)
+                token = self.auth_manager.get_token(deadline)
+                headers = {"Authorization": f"Bearer {token}"}
+                timeout = deadline.timeout(self.REQUEST_TIMEOUT)
+                response = requests.request(method, url, headers=headers, params=params, timeout=timeout)
                 if response.status_code == 401:
                     logger.warning(f"[{self.tenant_id}] 🔐 Token expirado. Renovando...")
-                    self.auth_manager.refresh_after_401()
+                    self.auth_manager.refresh_after_401(deadline)
                     continue
                 if response.status_code == 429:
                     wait = delay * (attempt + 1)
                     logger.warning(f"[{self.tenant_id}] ⏳ Rate limit. Esperando {wait}s...")
-                    time.sleep(wait)
+                    error = requests.HTTPError(f"429 Rate limit {method} {path}", response=response)
+                    self._retry_sleep(deadline, wait, error)
                     continue
                 response.raise_for_status()
                 return response.json()
             except requests.RequestException as ex:
+                if getattr(getattr(ex, "response", None), "status_code", None) == 429:
+                    raise  # rate limit sin margen para reintentar (_retry_sleep)
+                if deadline.expired():
+                    raise DeadlineExceeded(f"{method} {path}: {ex}") from ex
                 logger.error(f"[{self.tenant_id}] ❌ Error HTTP {method} {path}: {ex}")
                 if attempt < retries - 1:
-                    time.sleep(delay)
+                    self._retry_sleep(deadline, delay, ex)
                     continue
                 raise
 
+    def _paginate(
+        self,
+        path: str,
+        params: dict | None = None,
+        deadline: Deadline | None = None,
+        max_results: int | None = None,
+    ) -> PartialList:
+        """
+        Recorre las páginas de un endpoint `queries` (after u offset/total) hasta `max_results`
+        (por defecto MAX_RESULTS). Si el deadline vence o se cancela entre páginas devuelve
+        lo acumulado marcado como parcial.
+        """
+        deadline = deadline or Deadline()
+        max_results = max_results or self.MAX_RESULTS
+        params = dict(params or {})
+        resources = PartialList()
+        while True:
+            try:
+                data = self._request("GET", path, params=params, deadline=deadline)
+            except DeadlineExceeded as ex:
+                logger.warning(
+                    f"[{self.tenant_id}] ⌛ {path}: deadline alcanzado tras {len(resources)} resultados. Devolviendo parcial."
+                )
+                resources.partial, resources.reason = True, str(ex)
+                return resources
+            page = (data.get("resources") if isinstance(data, dict) else None) or []
+            resources.extend(page)
+            pagination = ((data.get("meta") or {}).get("pagination") or {}) if isinstance(data, dict) else {}
+            after = pagination.get("after")
+            total = pagination.get("total")
+            if not page or (isinstance(total, int) and len(resources) >= total):
+                return resources
+            if len(resources) >= max_results:
+                logger.info(f"[{self.tenant_id}] ✂️ {path}: límite de {max_results} resultados alcanzado.")
+                del resources[max_results:]
+                return resources
+            if after:
+                if after == params.get("after"):
+                    logger.warning(f"[{self.tenant_id}] ⚠️ {path}: token 'after' repetido. Fin de paginación.")
+                    return resources
+                params["after"] = after
+            elif isinstance(total, int):
+                params["offset"] = len(resources)
+            else:
+                return resources
+
     # Jobs
-    def list_hosts(self, limit: int = 50):
+    def list_hosts(self, limit: int = 50, deadline: Deadline | None = None):
+        deadline = deadline or Deadline()
         retries = 3
         delay = 2
         for attempt in range(retries):
+            deadline.check("hosts")
             try:
-                api = self._client_hosts()
+                api = self._client_hosts(deadline)
                 resp = api.query_devices_by_filter_scroll(limit=limit)
                 resources = resp.get("resources", [])
                 logger.info(f"[{self.tenant_id}] 💻 {len(resources)} hosts encontrados.")
@@ -70,31 +140,37 @@ class FalconPyAdapter:
                 msg = str(e)
                 if code == 401 or "Unauthorized" in msg:
                     logger.warning(f"[{self.tenant_id}] 🔐 Token expirado. Renovando...")
-                    self.auth_manager.refresh_after_401()
+                    self.auth_manager.refresh_after_401(deadline)
                     continue
                 if code == 429:
                     wait = delay * (attempt + 1)
                     logger.warning(f"[{self.tenant_id}] ⏳ Rate limit. Esperando {wait}s...")
-                    time.sleep(wait)
+                    self._retry_sleep(deadline, wait, e)
                     continue
                 logger.error(f"[{self.tenant_id}] ❌ APIError hosts: {e}")
                 raise
+            except DeadlineExceeded:
+                raise
             except Exception as ex:
                 if "401" in str(ex) or "Unauthorized" in str(ex):
-                    self.auth_manager.refresh_after_401()
+                    self.auth_manager.refresh_after_401(deadline)
                     continue
+                if deadline.expired():
+                    raise DeadlineExceeded(str(ex)) from ex
                 logger.error(f"[{self.tenant_id}] ❌ Error inesperado hosts: {ex}")
                 if attempt < retries - 1:
-                    time.sleep(delay)
+                    self._retry_sleep(deadline, delay, ex)
                     continue
                 raise
 
-    def list_detections(self, filter_query: str = ""):
+    def list_detections(self, filter_query: str = "", deadline: Deadline | None = None):
+        deadline = deadline or Deadline()
         retries = 3
         delay = 2
         for attempt in range(retries):
+            deadline.check("detections")
             try:
-                api = self._client_detects()
+                api = self._client_detects(deadline)
                 resp = api.query_detects(filter=filter_query)
                 resources = resp.get("resources", [])
                 logger.info(f"[{self.tenant_id}] ⚠️ {len(resources)} detecciones encontradas.")
@@ -104,90 +180,94 @@ class FalconPyAdapter:
                 msg = str(e)
                 if code == 401 or "Unauthorized" in msg:
                     logger.warning(f"[{self.tenant_id}] 🔐 Token expirado. Renovando...")
-                    self.auth_manager.refresh_after_401()
+                    self.auth_manager.refresh_after_401(deadline)
                     continue
                 if code == 429:
                     wait = delay * (attempt + 1)
                     logger.warning(f"[{self.tenant_id}] ⏳ Rate limit. Esperando {wait}s...")
-                    time.sleep(wait)
+                    self._retry_sleep(deadline, wait, e)
                     continue
                 logger.error(f"[{self.tenant_id}] ❌ APIError detections: {e}")
                 raise
+            except DeadlineExceeded:
+                raise
             except Exception as ex:
                 if "401" in str(ex) or "Unauthorized" in str(ex):
-                    self.auth_manager.refresh_after_401()
+                    self.auth_manager.refresh_after_401(deadline)
                     continue
+                if deadline.expired():
+                    raise DeadlineExceeded(str(ex)) from ex
                 logger.error(f"[{self.tenant_id}] ❌ Error inesperado detections: {ex}")
                 if attempt < retries - 1:
-                    time.sleep(delay)
+                    self._retry_sleep(deadline, delay, ex)
                     continue
                 raise
 
     # Nuevos endpoints
-    def get_device_metadata(self, device_ids: Iterable[str]):
+    def get_device_metadata(self, device_ids: Iterable[str], deadline: Deadline | None = None):
         ids = [i for i in (device_ids or []) if i]
         if not ids:
             logger.info(f"[{self.tenant_id}] ℹ️ Sin device_ids para RF-015.")
             return []
         params = {"ids": ",".join(ids)}
-        data = self._request("GET", "/devices/entities/devices/v1", params=params)
+        data = self._request("GET", "/devices/entities/devices/v1", params=params, deadline=deadline)
         resources = data.get("resources", []) if isinstance(data, dict) else []
         logger.info(f"[{self.tenant_id}] 💻 {len(resources)} endpoints consultados (RF-015).")
         return resources
 
-    def search_devices_by_ip(self, filter_query: str):
+    def search_devices_by_ip(self, filter_query: str, deadline: Deadline | None = None):
         params = {"filter": filter_query}
-        data = self._request("GET", "/devices/queries/devices/v1", params=params)
-        resources = data.get("resources", []) if isinstance(data, dict) else []
+        resources = self._paginate("/devices/queries/devices/v1", params=params, deadline=deadline)
         logger.info(f"[{self.tenant_id}] 🌐 {len(resources)} endpoints filtrados por red (RF-016).")
         return resources
 
-    def search_processes_by_hash(self, sha256_hash: str):
+    def search_processes_by_hash(self, sha256_hash: str, deadline: Deadline | None = None):
         filter_query = f"sha256:'{sha256_hash}'"
         params = {"filter": filter_query}
-        data = self._request("GET", "/queries/processes/v1", params=params)
-        resources = data.get("resources", []) if isinstance(data, dict) else []
+        resources = self._paginate("/queries/processes/v1", params=params, deadline=deadline)
         logger.info(f"[{self.tenant_id}] 🧬 {len(resources)} procesos encontrados por hash (RF-017).")
         return resources
 
-    def search_files_by_path(self, path_pattern: str):
+    def search_files_by_path(self, path_pattern: str, deadline: Deadline | None = None):
         filter_query = f"path:{path_pattern}"
         params = {"filter": filter_query}
-        data = self._request("GET", "/queries/files/v1", params=params)
-        resources = data.get("resources", []) if isinstance(data, dict) else []
+        resources = self._paginate("/queries/files/v1", params=params, deadline=deadline)
         logger.info(f"[{self.tenant_id}] 📁 {len(resources)} archivos encontrados por ruta (RF-019).")
         return resources
 
-    def search_network_contacts(self, remote_ip_filter: str):
+    def search_network_contacts(self, remote_ip_filter: str, deadline: Deadline | None = None):
         filter_query = f"remote_ip:'{remote_ip_filter}'"
         params = {"filter": filter_query}
-        data = self._request("GET", "/queries/network-events/v1", params=params)
-        resources = data.get("resources", []) if isinstance(data, dict) else []
+        resources = self._paginate("/queries/network-events/v1", params=params, deadline=deadline)
         logger.info(f"[{self.tenant_id}] 🔌 {len(resources)} contactos de red encontrados (RF-021).")
         return resources
 
-    def search_domain_contacts(self, domain_name: str):
+    def search_domain_contacts(self, domain_name: str, deadline: Deadline | None = None):
         filter_query = f"domain_name:'{domain_name}'"
         params = {"filter": filter_query}
-        data = self._request("GET", "/queries/dns-events/v1", params=params)
-        resources = data.get("resources", []) if isinstance(data, dict) else []
+        resources = self._paginate("/queries/dns-events/v1", params=params, deadline=deadline)
         logger.info(f"[{self.tenant_id}] 🌍 {len(resources)} eventos DNS encontrados (RF-022).")
         return resources
 
-    def search_processes_by_cmdline(self, cmdline_pattern: str):
+    def search_processes_by_cmdline(self, cmdline_pattern: str, deadline: Deadline | None = None):
         filter_query = f"cmdline:'{cmdline_pattern}'"
         params = {"filter": filter_query}
-        data = self._request("GET", "/queries/processes/v1", params=params)
-        resources = data.get("resources", []) if isinstance(data, dict) else []
+        resources = self._paginate("/queries/processes/v1", params=params, deadline=deadline)
         logger.info(f"[{self.tenant_id}] 💻 {len(resources)} procesos por cmdline (RF-024).")
         return resources
 
-    def get_process_tree(self, process_id: str):
-        process_detail = self._request("GET", "/entities/processes/v1", params={"ids": process_id})
-        children = self._request("GET", "/entities/processes/children/v1", params={"ids": process_id})
+    def get_process_tree(self, process_id: str, deadline: Deadline | None = None):
+        process_detail = self._request("GET", "/entities/processes/v1", params={"ids": process_id}, deadline=deadline)
         detail_resources = process_detail.get("resources", []) if isinstance(process_detail, dict) else []
+        try:
+            children = self._request(
+                "GET", "/entities/processes/children/v1", params={"ids": process_id}, deadline=deadline
+            )
+        except DeadlineExceeded:
+            logger.warning(f"[{self.tenant_id}] ⌛ Proceso {process_id}: deadline antes de obtener hijos (RF-025).")
+            return {"process": detail_resources, "children": [], "partial": True}
         child_resources = children.get("resources", []) if isinstance(children, dict) else []
         logger.info(
             f"[{self.tenant_id}] 🌳 Proceso {process_id}: detalle {len(detail_resources)} / hijos {len(child_resources)} (RF-025)."
         )
-        return {"process": detail_resources, "children": child_resources}
+        return {"process": detail_resources, "children": child_resources, "partial": False}
@@ -2,18 +2,20 @@ import requests
 import time
 import logging
 from falcon_app.infrastructure.services.token_cache import get_token_cache
+from falcon_app.infrastructure.services.deadline import Deadline, DeadlineExceeded
 
 logger = logging.getLogger(__name__)
 
 class FalconAuthManager:
     TOKEN_URL = "https://api.crowdstrike.com/oauth2/token"
+    TOKEN_TIMEOUT = 10
 
     def __init__(self, tenant_id: str, client_id: str, client_secret: str):
         self.tenant_id = tenant_id
         self.client_id = client_id
         self.client_secret = client_secret
 
-    def get_token(self) -> str:
+    def get_token(self, deadline: Deadline | None = None) -> str:
         """Obtiene un token válido desde cache o solicitando uno nuevo."""
         cache = get_token_cache()
         token = cache.get(self.tenant_id)
@@ -21,10 +23,12 @@ class FalconAuthManager:
             logger.debug(f"[{self.tenant_id}] Token obtenido desde cache.")
             return token
 
-        return self._request_new_token()
+        return self._request_new_token(deadline)
 
-    def _request_new_token(self) -> str:
-        """Solicita un nuevo token a Falcon OAuth2 y lo guarda en cache."""
+    def _request_new_token(self, deadline: Deadline | None = None) -> str:
+        """Solicita un nuevo token a Falcon OAuth2 y lo guarda en cache (timeout acotado por el deadline)."""
+        deadline = deadline or Deadline()
+        timeout = deadline.timeout(self.TOKEN_TIMEOUT)
         cache = get_token_cache()
         logger.info(f"[{self.tenant_id}] 🔑 Solicitando nuevo token a Falcon OAuth...")
 
@@ -32,10 +36,12 @@ class FalconAuthManager:
             response = requests.post(self.TOKEN_URL, data={
                 "client_id": self.client_id,
                 "client_secret": self.client_secret
-            }, timeout=10)
+            }, timeout=timeout)
             response.raise_for_status()
             data = response.json()
         except requests.RequestException as e:
+            if deadline.expired():
+                raise DeadlineExceeded(f"Token OAuth: {e}") from e
             logger.error(f"[{self.tenant_id}] ❌ Error al solicitar token: {e}")
             raise
 
@@ -53,8 +59,8 @@ class FalconAuthManager:
         cache.invalidate(self.tenant_id)
         logger.info(f"[{self.tenant_id}] 🧹 Token invalidado manualmente.")
 
-    def refresh_after_401(self) -> str:
+    def refresh_after_401(self, deadline: Deadline | None = None) -> str:
         """Invalida el token y solicita uno nuevo tras error 401."""
         logger.warning(f"[{self.tenant_id}] Token expirado o inválido. Renovando...")
         self.invalidate()
-        return self._request_new_token()
+        return self._request_new_token(deadline)
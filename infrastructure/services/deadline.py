@@ -0,0 +1,110 @@
+import time
+import threading
+
+
+class DeadlineExceeded(Exception):
+    """Se agotó el presupuesto de tiempo o se canceló la ejecución."""
+
+
+class Deadline:
+    """
+    Presupuesto de tiempo cancelable, compartible entre el event loop y los hilos del adapter.
+    - `expires_at` es un instante de `time.time()` para que siga siendo válido en otros procesos.
+    - `cancel()` se propaga a los deadlines hijos y despierta las esperas en curso.
+    - Al serializarse (ProcessPoolExecutor) solo viaja el límite temporal y el estado de cancelación.
+    """
+
+    def __init__(self, expires_at: float | None = None):
+        self.expires_at = expires_at
+        self._event = threading.Event()
+        self._children: list["Deadline"] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def after(cls, seconds: float | None) -> "Deadline":
+        return cls(None if seconds is None else time.time() + seconds)
+
+    def child(self, seconds: float | None = None) -> "Deadline":
+        """Deadline hijo: expira en `seconds` sin superar nunca al padre y se cancela con él."""
+        expires_at = self.expires_at
+        if seconds is not None:
+            own = time.time() + seconds
+            expires_at = own if expires_at is None else min(expires_at, own)
+        child = Deadline(expires_at)
+        with self._lock:
+            self._children.append(child)
+            if self._event.is_set():
+                child.cancel()
+        return child
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            self._event.set()
+            children = list(self._children)
+        for child in children:
+            child.cancel()
+
+    def remaining(self) -> float | None:
+        """Segundos restantes (None si no hay límite temporal)."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.time())
+
+    def expired(self) -> bool:
+        if self.cancelled:
+            return True
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def check(self, what: str = ""):
+        if self.cancelled:
+            raise DeadlineExceeded(f"Cancelado{f' ({what})' if what else ''}")
+        if self.expired():
+            raise DeadlineExceeded(f"Deadline agotado{f' ({what})' if what else ''}")
+
+    def timeout(self, default: float) -> float:
+        """Timeout de petición recortado al presupuesto restante (nunca 0: requests lo rechaza)."""
+        if self.cancelled:
+            raise DeadlineExceeded("Cancelado")
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline agotado")
+        return min(default, remaining)
+
+    def sleep(self, seconds: float):
+        """Espera interrumpible; si la espera no cabe en el presupuesto se aborta de inmediato."""
+        self.check()
+        remaining = self.remaining()
+        if remaining is not None and remaining < seconds:
+            raise DeadlineExceeded(f"Espera de {seconds}s supera el presupuesto restante ({remaining:.1f}s)")
+        if self._event.wait(seconds):
+            self.check()
+
+    def __getstate__(self):
+        return {"expires_at": self.expires_at, "cancelled": self.cancelled}
+
+    def __setstate__(self, state):
+        self.__init__(state["expires_at"])
+        if state["cancelled"]:
+            self._event.set()
+
+
+class PartialList(list):
+    """Lista de resultados que recuerda si quedó incompleta por deadline o cancelación."""
+
+    def __init__(self, items=(), partial: bool = False, reason: str | None = None):
+        super().__init__(items)
+        self.partial = partial
+        self.reason = reason
+
+
+def is_partial(result) -> bool:
+    if isinstance(result, dict):
+        return bool(result.get("partial"))
+    return bool(getattr(result, "partial", False))
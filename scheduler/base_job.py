@@ -1,38 +1,120 @@
 import asyncio
+import functools
 import logging
 from abc import ABC, abstractmethod
 from falcon_app.infrastructure.repositories.tenant_repository import TenantRepository
+from falcon_app.infrastructure.services.deadline import Deadline, DeadlineExceeded, is_partial
 
 logger = logging.getLogger(__name__)
 
 class BaseJob(ABC):
     """Clase base para jobs Falcon multitenant."""
-    def __init__(self, name: str, stop_flag: asyncio.Event | None = None, multiprocess: bool = False):
+
+    # Margen para que el adapter devuelva su resultado parcial antes de abandonar la llamada.
+    DEADLINE_GRACE_SECONDS = 1.0
+
+    def __init__(
+        self,
+        name: str,
+        stop_flag: asyncio.Event | None = None,
+        multiprocess: bool = False,
+        cycle_deadline: Deadline | None = None,
+        tenant_timeout: float | None = None,
+    ):
         self.name = name
         self.stop_flag = stop_flag or asyncio.Event()
         self.multiprocess = multiprocess
+        self.cycle_deadline = cycle_deadline or Deadline()
+        self.tenant_timeout = tenant_timeout
+        self.results: dict[str, dict] = {}
         self._executor = None
         if self.multiprocess:
             from concurrent.futures import ProcessPoolExecutor
             self._executor = ProcessPoolExecutor(max_workers=4)
 
-    async def execute(self):
+    async def execute(self) -> dict[str, dict]:
         tenants = TenantRepository().get_active_tenants()
         logger.info(f"🚀 {self.name}: ejecutando para {len(tenants)} tenants.")
-        tasks = [self._process_tenant(t) for t in tenants]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        watcher = asyncio.create_task(self._watch_stop_flag())
+        try:
+            tasks = [self._process_tenant(t, self.cycle_deadline.child(self.tenant_timeout)) for t in tenants]
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            watcher.cancel()
+        partial = [tenant for tenant, r in self.results.items() if r["partial"]]
+        if partial:
+            logger.warning(f"⌛ {self.name}: resultados parciales en {len(partial)} tenants: {', '.join(partial)}")
+        return self.results
+
+    async def _watch_stop_flag(self):
+        """Propaga el stop_flag al deadline del ciclo para interrumpir esperas y paginaciones en curso."""
+        await self.stop_flag.wait()
+        logger.warning(f"🛑 {self.name}: cancelación solicitada.")
+        self.cycle_deadline.cancel()
+        await self.cancel()
 
-    async def _run_callable(self, func, *args):
+    async def _run_callable(self, func, *args, deadline: Deadline | None = None):
+        """
+        Ejecuta `func` en hilo/proceso. Con deadline, la llamada se abandona al agotarse
+        el presupuesto (más un margen para que el adapter devuelva parciales) o al activarse el stop_flag.
+        """
         loop = asyncio.get_running_loop()
+        name = getattr(func, "__name__", repr(func))
+        if deadline is not None:
+            func = functools.partial(func, deadline=deadline)
         if self._executor:
-            return await loop.run_in_executor(self._executor, func, *args)
-        return await asyncio.to_thread(func, *args)
+            try:
+                call = asyncio.ensure_future(loop.run_in_executor(self._executor, func, *args))
+            except RuntimeError as ex:
+                # El executor ya se cerró por cancelación del job.
+                if self.stop_flag.is_set() or (deadline is not None and deadline.expired()):
+                    raise DeadlineExceeded(f"{name} no iniciado: job cancelado") from ex
+                raise
+        else:
+            call = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        if deadline is None:
+            return await call
+
+        remaining = deadline.remaining()
+        timeout = None if remaining is None else remaining + self.DEADLINE_GRACE_SECONDS
+        stop = asyncio.create_task(self.stop_flag.wait())
+        try:
+            done, _ = await asyncio.wait({call, stop}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop.cancel()
+        if call not in done and stop in done:
+            # Stop: se cancela el deadline y se da un margen para que el adapter devuelva parciales.
+            deadline.cancel()
+            done, _ = await asyncio.wait({call}, timeout=self.DEADLINE_GRACE_SECONDS)
+        if call in done:
+            if call.cancelled():
+                # shutdown(cancel_futures=True) descartó la llamada antes de que empezara.
+                deadline.cancel()
+                raise DeadlineExceeded(f"{name} descartado: job cancelado")
+            return call.result()
+        # El hilo/proceso se abandona; sus timeouts ya están acotados por el deadline.
+        call.cancel()
+        deadline.cancel()
+        raise DeadlineExceeded(f"{name} interrumpido por deadline o cancelación")
+
+    def _record(
+        self, tenant, result=None, partial: bool | None = None, count: int | None = None, error: str | None = None
+    ):
+        """Registra el resultado de un tenant (completo, parcial o con error) en `self.results`."""
+        if count is None:
+            count = len(result) if isinstance(result, (list, tuple)) else 0
+        self.results[tenant.id] = {
+            "data": result,
+            "count": count,
+            "partial": is_partial(result) if partial is None else partial,
+            "error": error,
+        }
 
     async def cancel(self):
         if self._executor:
-            self._executor.shutdown(cancel_futures=True)
+            self._executor.shutdown(wait=False, cancel_futures=True)
             logger.info(f"{self.name}: procesos cancelados.")
 
     @abstractmethod
-    async def _process_tenant(self, tenant):
+    async def _process_tenant(self, tenant, deadline: Deadline):
         ...
@@ -1,12 +1,20 @@
 import asyncio
 import logging
 from falcon_app.scheduler.job_registry import get_job
+from falcon_app.infrastructure.services.deadline import Deadline
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("falcon-scheduler")
 
 class FalconScheduler:
-    def __init__(self, jobs=None, interval_seconds: int = 600, multiprocess: bool = False):
+    def __init__(
+        self,
+        jobs=None,
+        interval_seconds: int = 600,
+        multiprocess: bool = False,
+        cycle_timeout: float | None = None,
+        tenant_timeout: float | None = None,
+    ):
         self.stop_flag = asyncio.Event()
         self.jobs_to_run = jobs or [
             "RF-015",
@@ -20,15 +28,40 @@ class FalconScheduler:
         ]
         self.interval = interval_seconds
         self.multiprocess = multiprocess
+        # Por defecto un ciclo nunca dura más que el intervalo entre ciclos.
+        self.cycle_timeout = cycle_timeout if cycle_timeout is not None else interval_seconds
+        self.tenant_timeout = tenant_timeout
+        self._cycle_deadline: Deadline | None = None
+        self.last_results: dict[str, dict[str, dict]] = {}
 
     async def _run_all_jobs(self):
+        self._cycle_deadline = Deadline.after(self.cycle_timeout)
         tasks = []
         for code in self.jobs_to_run:
             job_class = get_job(code)
-            job = job_class(stop_flag=self.stop_flag, multiprocess=self.multiprocess)
+            job = job_class(
+                stop_flag=self.stop_flag,
+                multiprocess=self.multiprocess,
+                cycle_deadline=self._cycle_deadline,
+                tenant_timeout=self.tenant_timeout,
+            )
             tasks.append(job.execute())
-        logger.info(f"🚀 Ejecutando jobs: {', '.join(self.jobs_to_run)}")
-        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(
+            f"🚀 Ejecutando jobs: {', '.join(self.jobs_to_run)} "
+            f"(deadline ciclo={self.cycle_timeout}s, tenant={self.tenant_timeout}s)"
+        )
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        self.last_results = {}
+        for code, outcome in zip(self.jobs_to_run, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"❌ {code}: job fallido: {outcome}")
+                continue
+            self.last_results[code] = outcome
+            errors = sum(1 for r in outcome.values() if r.get("error"))
+            partial = sum(1 for r in outcome.values() if r["partial"] and not r.get("error"))
+            complete = len(outcome) - errors - partial
+            logger.info(f"📊 {code}: {complete} completos / {partial} parciales / {errors} con error")
+        return self.last_results
 
     async def start(self):
         logger.info(f"🕓 Scheduler iniciado. Intervalo: {self.interval}s. multiprocess={self.multiprocess}")
@@ -42,9 +75,11 @@ class FalconScheduler:
     async def stop(self):
         logger.info("🛑 Deteniendo scheduler...")
         self.stop_flag.set()
+        if self._cycle_deadline:
+            self._cycle_deadline.cancel()
 
 async def main():
-    scheduler = FalconScheduler(interval_seconds=300, multiprocess=True)
+    scheduler = FalconScheduler(interval_seconds=300, multiprocess=True, tenant_timeout=120)
     try:
         await scheduler.start()
     except asyncio.CancelledError:
@@ -2,6 +2,7 @@ import logging
 
 from falcon_app.scheduler.base_job import BaseJob
 from falcon_app.infrastructure.adapters.falcon_adapter import FalconPyAdapter
+from falcon_app.infrastructure.services.deadline import DeadlineExceeded
 
 logger = logging.getLogger(__name__)
 
@@ -9,21 +10,35 @@ logger = logging.getLogger(__name__)
 class FalconEndpointMetadataJob(BaseJob):
     """RF-015 – Obtener información de endpoints."""
 
-    def __init__(self, stop_flag=None, multiprocess=False):
-        super().__init__(name="RF-015 - Endpoint metadata", stop_flag=stop_flag, multiprocess=multiprocess)
+    def __init__(self, stop_flag=None, multiprocess=False, cycle_deadline=None, tenant_timeout=None):
+        super().__init__(
+            name="RF-015 - Endpoint metadata",
+            stop_flag=stop_flag,
+            multiprocess=multiprocess,
+            cycle_deadline=cycle_deadline,
+            tenant_timeout=tenant_timeout,
+        )
 
-    async def _process_tenant(self, tenant):
-        if self.stop_flag.is_set():
+    async def _process_tenant(self, tenant, deadline):
+        if self.stop_flag.is_set() or deadline.expired():
             logger.warning(f"[{tenant.name}] 🛑 RF-015 cancelado antes de iniciar.")
+            self._record(tenant, partial=True)
             return
 
+        host_ids: list[str] = []
         try:
             adapter = FalconPyAdapter(tenant.id, tenant.client_id, tenant.client_secret)
-            hosts = await self._run_callable(adapter.list_hosts)
-            host_ids: list[str] = []
+            hosts = await self._run_callable(adapter.list_hosts, deadline=deadline)
             if isinstance(hosts, list):
                 host_ids = [h.get("device_id") or h.get("id") for h in hosts if isinstance(h, dict)]
-            metadata = await self._run_callable(adapter.get_device_metadata, host_ids[:50])
+            deadline.check("RF-015 metadata")
+            metadata = await self._run_callable(adapter.get_device_metadata, host_ids[:50], deadline=deadline)
+            self._record(tenant, metadata)
             logger.info(f"[{tenant.name}] ✅ RF-015 retornó {len(metadata)} endpoints.")
+        except DeadlineExceeded as ex:
+            # Si ya se listaron hosts, se registran sus IDs como resultado parcial (sin metadata).
+            self._record(tenant, host_ids, partial=True)
+            logger.warning(f"[{tenant.name}] ⌛ RF-015 interrumpido con {len(host_ids)} hosts sin metadata: {ex}")
         except Exception as ex:
+            self._record(tenant, error=str(ex))
             logger.error(f"[{tenant.name}] ❌ Error RF-015: {ex}")
@@ -2,6 +2,7 @@ import logging
 
 from falcon_app.scheduler.base_job import BaseJob
 from falcon_app.infrastructure.adapters.falcon_adapter import FalconPyAdapter
+from falcon_app.infrastructure.services.deadline import DeadlineExceeded
 
 logger = logging.getLogger(__name__)
 
@@ -9,19 +10,33 @@ logger = logging.getLogger(__name__)
 class FalconProcessTreeJob(BaseJob):
     """RF-025 – Reconstruir árbol de procesos."""
 
-    def __init__(self, stop_flag=None, multiprocess=False, process_id: str | None = None):
-        super().__init__(name="RF-025 - Árbol de procesos", stop_flag=stop_flag, multiprocess=multiprocess)
+    def __init__(
+        self, stop_flag=None, multiprocess=False, process_id: str | None = None, cycle_deadline=None, tenant_timeout=None
+    ):
+        super().__init__(
+            name="RF-025 - Árbol de procesos",
+            stop_flag=stop_flag,
+            multiprocess=multiprocess,
+            cycle_deadline=cycle_deadline,
+            tenant_timeout=tenant_timeout,
+        )
         self.process_id = process_id or "process-id-demo"
 
-    async def _process_tenant(self, tenant):
-        if self.stop_flag.is_set():
+    async def _process_tenant(self, tenant, deadline):
+        if self.stop_flag.is_set() or deadline.expired():
             logger.warning(f"[{tenant.name}] 🛑 RF-025 cancelado antes de iniciar.")
+            self._record(tenant, partial=True)
             return
 
         try:
             adapter = FalconPyAdapter(tenant.id, tenant.client_id, tenant.client_secret)
-            tree = await self._run_callable(adapter.get_process_tree, self.process_id)
+            tree = await self._run_callable(adapter.get_process_tree, self.process_id, deadline=deadline)
             children = tree.get("children", []) if isinstance(tree, dict) else []
+            self._record(tenant, tree, count=len(children))
             logger.info(f"[{tenant.name}] ✅ RF-025 retornó {len(children)} hijos para {self.process_id}.")
+        except DeadlineExceeded as ex:
+            self._record(tenant, partial=True)
+            logger.warning(f"[{tenant.name}] ⌛ RF-025 interrumpido sin resultados: {ex}")
         except Exception as ex:
+            self._record(tenant, error=str(ex))
             logger.error(f"[{tenant.name}] ❌ Error RF-025: {ex}")
@@ -2,6 +2,7 @@ import logging
 
 from falcon_app.scheduler.base_job import BaseJob
 from falcon_app.infrastructure.adapters.falcon_adapter import FalconPyAdapter
+from falcon_app.infrastructure.services.deadline import DeadlineExceeded
 
 logger = logging.getLogger(__name__)
 
@@ -9,18 +10,32 @@ logger = logging.getLogger(__name__)
 class FalconSearchDevicesByIpJob(BaseJob):
     """RF-016 – Filtrar endpoints por IP/CIDR."""
 
-    def __init__(self, stop_flag=None, multiprocess=False, filter_query: str | None = None):
-        super().__init__(name="RF-016 - Buscar hosts por red", stop_flag=stop_flag, multiprocess=multiprocess)
+    def __init__(
+        self, stop_flag=None, multiprocess=False, filter_query: str | None = None, cycle_deadline=None, tenant_timeout=None
+    ):
+        super().__init__(
+            name="RF-016 - Buscar hosts por red",
+            stop_flag=stop_flag,
+            multiprocess=multiprocess,
+            cycle_deadline=cycle_deadline,
+            tenant_timeout=tenant_timeout,
+        )
         self.filter_query = filter_query or "local_ip_address:*192.168.*"
 
-    async def _process_tenant(self, tenant):
-        if self.stop_flag.is_set():
+    async def _process_tenant(self, tenant, deadline):
+        if self.stop_flag.is_set() or deadline.expired():
             logger.warning(f"[{tenant.name}] 🛑 RF-016 cancelado antes de iniciar.")
+            self._record(tenant, partial=True)
             return
 
         try:
             adapter = FalconPyAdapter(tenant.id, tenant.client_id, tenant.client_secret)
-            results = await self._run_callable(adapter.search_devices_by_ip, self.filter_query)
+            results = await self._run_callable(adapter.search_devices_by_ip, self.filter_query, deadline=deadline)
+            self._record(tenant, results)
             logger.info(f"[{tenant.name}] ✅ RF-016 retornó {len(results)} hosts.")
+        except DeadlineExceeded as ex:
+            self._record(tenant, partial=True)
+            logger.warning(f"[{tenant.name}] ⌛ RF-016 interrumpido sin resultados: {ex}")
         except Exception as ex:
+            self._record(tenant, error=str(ex))
             logger.error(f"[{tenant.name}] ❌ Error RF-016: {ex}")
@@ -2,6 +2,7 @@ import logging
 
 from falcon_app.scheduler.base_job import BaseJob
 from falcon_app.infrastructure.adapters.falcon_adapter import FalconPyAdapter
+from falcon_app.infrastructure.services.deadline import DeadlineExceeded
 
 logger = logging.getLogger(__name__)
 
@@ -9,18 +10,32 @@ logger = logging.getLogger(__name__)
 class FalconSearchNetworkContactsJob(BaseJob):
     """RF-021 – Consultar contactos de red por IP/subred."""
 
-    def __init__(self, stop_flag=None, multiprocess=False, remote_ip: str | None = None):
-        super().__init__(name="RF-021 - Contactos de red", stop_flag=stop_flag, multiprocess=multiprocess)
+    def __init__(
+        self, stop_flag=None, multiprocess=False, remote_ip: str | None = None, cycle_deadline=None, tenant_timeout=None
+    ):
+        super().__init__(
+            name="RF-021 - Contactos de red",
+            stop_flag=stop_flag,
+            multiprocess=multiprocess,
+            cycle_deadline=cycle_deadline,
+            tenant_timeout=tenant_timeout,
+        )
         self.remote_ip = remote_ip or "8.8.8.8"
 
-    async def _process_tenant(self, tenant):
-        if self.stop_flag.is_set():
+    async def _process_tenant(self, tenant, deadline):
+        if self.stop_flag.is_set() or deadline.expired():
             logger.warning(f"[{tenant.name}] 🛑 RF-021 cancelado antes de iniciar.")
+            self._record(tenant, partial=True)
             return
 
         try:
             adapter = FalconPyAdapter(tenant.id, tenant.client_id, tenant.client_secret)
-            results = await self._run_callable(adapter.search_network_contacts, self.remote_ip)
+            results = await self._run_callable(adapter.search_network_contacts, self.remote_ip, deadline=deadline)
+            self._record(tenant, results)
             logger.info(f"[{tenant.name}] ✅ RF-021 retornó {len(results)} contactos.")
+        except DeadlineExceeded as ex:
+            self._record(tenant, partial=True)
+            logger.warning(f"[{tenant.name}] ⌛ RF-021 interrumpido sin resultados: {ex}")
         except Exception as ex:
+            self._record(tenant, error=str(ex))
             logger.error(f"[{tenant.name}] ❌ Error RF-021: {ex}")
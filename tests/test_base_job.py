@@ -0,0 +1,125 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from falcon_app.scheduler.base_job import BaseJob
+from falcon_app.scheduler.jobs.falcon_search_devices_ip_job import FalconSearchDevicesByIpJob
+from falcon_app.infrastructure.adapters.falcon_adapter import FalconPyAdapter
+from falcon_app.infrastructure.repositories.tenant_repository import Tenant, TenantRepository
+from falcon_app.infrastructure.services.deadline import Deadline, DeadlineExceeded, PartialList
+
+
+class DummyJob(BaseJob):
+    DEADLINE_GRACE_SECONDS = 0.3
+
+    def __init__(self, **kwargs):
+        super().__init__(name="dummy", **kwargs)
+
+    async def _process_tenant(self, tenant, deadline):
+        ...
+
+
+def cooperative(deadline):
+    """Simula una paginación que devuelve lo acumulado al cancelarse."""
+    items = PartialList()
+    while not deadline.expired():
+        items.append(len(items))
+        time.sleep(0.02)
+    items.partial = True
+    return items
+
+
+def stubborn(deadline):
+    time.sleep(1)
+    return ["tarde"]
+
+
+def test_run_callable_abandons_on_timeout():
+    async def run():
+        job = DummyJob()
+        start = time.time()
+        with pytest.raises(DeadlineExceeded):
+            await job._run_callable(stubborn, deadline=Deadline.after(0.1))
+        return time.time() - start
+
+    assert asyncio.run(run()) < 0.9
+
+
+def test_run_callable_returns_partial_on_stop():
+    async def run():
+        stop = asyncio.Event()
+        job = DummyJob(stop_flag=stop)
+        asyncio.get_running_loop().call_later(0.2, stop.set)
+        return await job._run_callable(cooperative, deadline=Deadline.after(30))
+
+    result = asyncio.run(run())
+    assert result and result.partial
+
+
+def test_run_callable_abandons_stubborn_call_on_stop():
+    async def run():
+        stop = asyncio.Event()
+        job = DummyJob(stop_flag=stop)
+        asyncio.get_running_loop().call_later(0.1, stop.set)
+        start = time.time()
+        with pytest.raises(DeadlineExceeded):
+            await job._run_callable(stubborn, deadline=Deadline.after(30))
+        return time.time() - start
+
+    assert asyncio.run(run()) < 0.9
+
+
+def test_run_callable_maps_executor_shutdown_to_deadline():
+    async def run():
+        stop = asyncio.Event()
+        stop.set()
+        job = DummyJob(stop_flag=stop)
+        job._executor = ThreadPoolExecutor(max_workers=1)
+        job._executor.shutdown()
+        with pytest.raises(DeadlineExceeded):
+            await job._run_callable(stubborn, deadline=Deadline.after(30))
+
+    asyncio.run(run())
+
+
+def test_skipped_tenants_are_recorded_by_id():
+    async def run():
+        stop = asyncio.Event()
+        stop.set()
+        job = FalconSearchDevicesByIpJob(stop_flag=stop)
+        await job.execute()
+        return job.results
+
+    results = asyncio.run(run())
+    assert set(results) == {"tenant-01", "tenant-02"}
+    assert all(r["partial"] and r["count"] == 0 for r in results.values())
+
+
+def test_queued_calls_cancelled_by_shutdown_are_recorded(monkeypatch):
+    """Más tenants que workers: las llamadas en cola que descarta shutdown() quedan registradas como parciales."""
+    tenants = [Tenant(id=f"t{i}", name=f"T{i}", client_id="id", client_secret="secret") for i in range(4)]
+    monkeypatch.setattr(TenantRepository, "get_active_tenants", lambda self: tenants)
+    monkeypatch.setattr(FalconPyAdapter, "search_devices_by_ip", lambda self, query, deadline: cooperative(deadline))
+
+    async def run():
+        stop = asyncio.Event()
+        job = FalconSearchDevicesByIpJob(stop_flag=stop, cycle_deadline=Deadline.after(30))
+        job._executor = ThreadPoolExecutor(max_workers=1)
+        asyncio.get_running_loop().call_later(0.2, stop.set)
+        return await job.execute()
+
+    results = asyncio.run(run())
+    assert set(results) == {"t0", "t1", "t2", "t3"}
+    assert all(r["partial"] and r["error"] is None for r in results.values())
+
+
+def test_failed_tenants_are_recorded_with_error(monkeypatch):
+    def fail(self, query, deadline):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(FalconPyAdapter, "search_devices_by_ip", fail)
+    results = asyncio.run(FalconSearchDevicesByIpJob(cycle_deadline=Deadline.after(30)).execute())
+    assert set(results) == {"tenant-01", "tenant-02"}
+    assert all(r["error"] == "boom" and not r["partial"] for r in results.values())
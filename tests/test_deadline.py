@@ -0,0 +1,62 @@
+import pickle
+import threading
+import time
+
+import pytest
+
+from falcon_app.infrastructure.services.deadline import Deadline, DeadlineExceeded, PartialList, is_partial
+
+
+def test_child_never_outlives_parent():
+    parent = Deadline.after(1)
+    assert parent.child(10).expires_at == parent.expires_at
+    assert parent.child(0.5).expires_at < parent.expires_at
+    assert Deadline().child(None).remaining() is None
+
+
+def test_cancel_propagates_to_children():
+    parent = Deadline.after(10)
+    child = parent.child(5)
+    parent.cancel()
+    assert child.cancelled and child.expired()
+    # Los hijos creados tras cancelar nacen cancelados.
+    assert parent.child(5).cancelled
+
+
+def test_sleep_wakes_up_on_cancel():
+    deadline = Deadline.after(10)
+    threading.Timer(0.1, deadline.cancel).start()
+    start = time.time()
+    with pytest.raises(DeadlineExceeded):
+        deadline.sleep(5)
+    assert time.time() - start < 1
+
+
+def test_sleep_longer_than_budget_fails_fast():
+    deadline = Deadline.after(0.2)
+    start = time.time()
+    with pytest.raises(DeadlineExceeded):
+        deadline.sleep(5)
+    assert time.time() - start < 0.1
+
+
+def test_timeout_is_clamped_and_never_zero():
+    assert Deadline().timeout(30) == 30
+    assert Deadline.after(5).timeout(30) <= 5
+    assert Deadline.after(60).timeout(30) == 30
+    with pytest.raises(DeadlineExceeded):
+        Deadline(time.time()).timeout(30)
+
+
+def test_pickle_keeps_expiry_and_cancellation():
+    deadline = Deadline.after(10)
+    copy = pickle.loads(pickle.dumps(deadline))
+    assert copy.expires_at == deadline.expires_at and not copy.cancelled
+    deadline.cancel()
+    assert pickle.loads(pickle.dumps(deadline)).cancelled
+
+
+def test_partial_list_pickles_with_flag():
+    result = pickle.loads(pickle.dumps(PartialList([1, 2], partial=True, reason="deadline")))
+    assert result == [1, 2] and result.partial and result.reason == "deadline"
+    assert is_partial(result) and is_partial({"partial": True}) and not is_partial([1])
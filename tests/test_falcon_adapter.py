@@ -0,0 +1,114 @@
+import pytest
+
+from falcon_app.infrastructure.adapters import falcon_adapter
+from falcon_app.infrastructure.adapters.falcon_adapter import FalconPyAdapter
+from falcon_app.infrastructure.services.deadline import Deadline, DeadlineExceeded
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+def page(resources, **pagination):
+    return {"resources": resources, "meta": {"pagination": pagination}}
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    adapter = FalconPyAdapter("tenant-test", "id", "secret")
+    monkeypatch.setattr(adapter.auth_manager, "get_token", lambda deadline=None: "token")
+    return adapter
+
+
+def stub_requests(monkeypatch, pages, on_call=None):
+    """Sustituye requests.request por una secuencia de páginas; registra params y timeouts."""
+    calls = []
+
+    def fake_request(method, url, headers=None, params=None, timeout=None):
+        calls.append({"params": dict(params or {}), "timeout": timeout})
+        if len(calls) > 10:
+            raise AssertionError("paginación sin fin")
+        if on_call:
+            on_call(len(calls))
+        return FakeResponse(pages[min(len(calls), len(pages)) - 1])
+
+    monkeypatch.setattr(falcon_adapter.requests, "request", fake_request)
+    return calls
+
+
+def test_paginate_follows_after_token(adapter, monkeypatch):
+    calls = stub_requests(monkeypatch, [page(["a", "b"], after="t1"), page(["c"], after="t2"), page([])])
+    result = adapter.search_devices_by_ip("filtro")
+    assert result == ["a", "b", "c"] and not result.partial
+    assert [c["params"].get("after") for c in calls] == [None, "t1", "t2"]
+
+
+def test_paginate_uses_offset_and_total(adapter, monkeypatch):
+    calls = stub_requests(monkeypatch, [page(["a", "b"], total=3), page(["c"], total=3)])
+    result = adapter.search_devices_by_ip("filtro")
+    assert result == ["a", "b", "c"]
+    assert [c["params"].get("offset") for c in calls] == [None, 2]
+
+
+@pytest.mark.parametrize("pages", [
+    [page([], after="tok", total=1)],
+    [page(["a"], after="tok", total=1)],
+    [page(["a"], after="tok"), page(["b"], after="tok")],
+])
+def test_paginate_stops_on_empty_page_total_or_repeated_token(adapter, monkeypatch, pages):
+    calls = stub_requests(monkeypatch, pages)
+    adapter.search_devices_by_ip("filtro")
+    assert len(calls) <= 2
+
+
+def test_paginate_returns_partial_when_cancelled(adapter, monkeypatch):
+    deadline = Deadline.after(30)
+    pages = [page(["a"], after="t1"), page(["b"], after="t2"), page(["c"], after="t3")]
+    calls = stub_requests(monkeypatch, pages, on_call=lambda n: n == 2 and deadline.cancel())
+    result = adapter.search_devices_by_ip("filtro", deadline=deadline)
+    assert result == ["a", "b"] and result.partial
+    assert len(calls) == 2
+
+
+def test_request_timeout_shrinks_to_budget(adapter, monkeypatch):
+    calls = stub_requests(monkeypatch, [page(["a"])])
+    adapter.search_devices_by_ip("filtro", deadline=Deadline.after(5))
+    assert 0 < calls[0]["timeout"] <= 5
+
+
+def test_paginate_stops_at_max_results(adapter, monkeypatch):
+    monkeypatch.setattr(FalconPyAdapter, "MAX_RESULTS", 3)
+    calls = stub_requests(monkeypatch, [page(["a", "b"], after="t1"), page(["c", "d"], after="t2"), page(["e"])])
+    result = adapter.search_devices_by_ip("filtro")
+    assert result == ["a", "b", "c"] and not result.partial
+    assert len(calls) == 2
+
+
+def test_rate_limit_without_budget_raises_api_error_not_deadline(adapter, monkeypatch):
+    class RateLimited(FakeResponse):
+        status_code = 429
+
+    monkeypatch.setattr(
+        falcon_adapter.requests, "request", lambda *args, **kwargs: RateLimited({})
+    )
+    with pytest.raises(falcon_adapter.requests.HTTPError, match="429"):
+        adapter.search_devices_by_ip("filtro", deadline=Deadline.after(1))
+
+
+def test_http_error_without_budget_keeps_original_error(adapter, monkeypatch):
+    def fail(*args, **kwargs):
+        raise falcon_adapter.requests.RequestException("conexión rechazada")
+
+    monkeypatch.setattr(falcon_adapter.requests, "request", fail)
+    with pytest.raises(falcon_adapter.requests.RequestException, match="conexión rechazada") as info:
+        adapter.search_devices_by_ip("filtro", deadline=Deadline.after(1))
+    assert not isinstance(info.value, DeadlineExceeded)
@@ -0,0 +1,28 @@
+import asyncio
+
+from falcon_app.scheduler import falcon_scheduler
+from falcon_app.scheduler.falcon_scheduler import FalconScheduler
+
+
+class FakeJob:
+    def __init__(self, stop_flag=None, multiprocess=False, cycle_deadline=None, tenant_timeout=None):
+        self.cycle_deadline = cycle_deadline
+
+    async def execute(self):
+        return {
+            "t1": {"data": [1], "count": 1, "partial": False, "error": None},
+            "t2": {"data": None, "count": 0, "partial": True, "error": None},
+            "t3": {"data": None, "count": 0, "partial": False, "error": "boom"},
+        }
+
+
+def test_run_all_jobs_collects_results_per_job(monkeypatch):
+    monkeypatch.setattr(falcon_scheduler, "get_job", lambda code: FakeJob)
+
+    async def run():
+        scheduler = FalconScheduler(jobs=["RF-016", "RF-017"], interval_seconds=5)
+        return await scheduler._run_all_jobs()
+
+    results = asyncio.run(run())
+    assert set(results) == {"RF-016", "RF-017"}
+    assert results["RF-016"]["t2"]["partial"] and results["RF-016"]["t3"]["error"] == "boom"